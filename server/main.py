@@ -1,19 +1,55 @@
 from __future__ import annotations
 
-from fastapi import FastAPI, HTTPException
+import asyncio
+import functools
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import List, Literal, Union
-from sympy import Matrix, symbols, simplify as sp_simplify, latex
+from typing import List, Literal, Optional, Union
+from sympy import Add, Float, ImmutableMatrix, Integer, symbols, simplify as sp_simplify
+from sympy.printing.latex import LatexPrinter
 from sympy.parsing.sympy_parser import (
     parse_expr,
     standard_transformations,
     implicit_multiplication_application,
 )
 
+try:
+    import symengine
+except ImportError:  # optional: determinants fall back to SymPy
+    symengine = None
+
 TRANSFORMS = standard_transformations + (implicit_multiplication_application,)
 
 
+_INT_RE = re.compile(r"-?[0-9]+")
+_FLOAT_RE = re.compile(r"-?(?:[0-9]+\.[0-9]*|\.[0-9]+)")
+
+
+def _parse(text: str):
+    # normalise before hitting the cache so ' 0' and '0' share a slot
+    text = text.strip()
+    if text == "":
+        text = "0"
+    # plain numbers don't need the parser at all
+    if _INT_RE.fullmatch(text):
+        return Integer(text)
+    if _FLOAT_RE.fullmatch(text):
+        return Float(text)
+    return _parse_cached(text)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_cached(text: str):
+    # parse with implicit multiplication, so inputs like '2a' work
+    return parse_expr(text, transformations=TRANSFORMS)
+
+
 class MatrixPayload(BaseModel):
     name: str
     rows: int
@@ -42,62 +78,71 @@ app.add_middleware(
 )
 
 
-def build_symbolic_matrix(data: List[List[str]]) -> Matrix:
+def build_symbolic_matrix(data: List[List[str]]) -> ImmutableMatrix:
     rows = len(data)
     cols = len(data[0]) if rows else 0
-    flat = []
-    for r in range(rows):
-        for c in range(cols):
-            text = str(data[r][c]).strip()
-            if text == "":
-                text = "0"
-            # parse with implicit multiplication, so inputs like '2a' work
-            flat.append(parse_expr(text, transformations=TRANSFORMS))
-    return Matrix(rows, cols, flat)
+    cleaned = [[str(data[r][c]).strip() or "0" for c in range(cols)] for r in range(rows)]
+    # Symbolic cells are parsed in one go: a single parser run over the whole
+    # matrix is much cheaper than one per cell. Plain numbers skip the parser
+    # anyway, so there is nothing to gain from joining them.
+    if any(not _is_number(text) for row in cleaned for text in row):
+        m = _parse_joined(cleaned)
+        if m is not None and m.shape == (rows, cols):
+            return m
+    flat = [_parse(text) for row in cleaned for text in row]
+    return ImmutableMatrix(rows, cols, flat)
+
+
+def _is_number(text: str) -> bool:
+    return bool(_INT_RE.fullmatch(text) or _FLOAT_RE.fullmatch(text))
+
+
+def _parse_joined(cleaned: List[List[str]]):
+    for row in cleaned:
+        for text in row:
+            # cells that could change the list structure go through the per-cell path
+            if "," in text or "[" in text or "]" in text or text.count("(") != text.count(")"):
+                return None
+    expr_str = "ImmutableMatrix([[" + "],[".join(",".join(row) for row in cleaned) + "]])"
+    try:
+        m = parse_expr(expr_str, transformations=TRANSFORMS, local_dict={"ImmutableMatrix": ImmutableMatrix})
+    except Exception:
+        return None
+    return m if isinstance(m, ImmutableMatrix) else None
+
+
+# Token kinds. Binary operators come first so `kind < LP` identifies them.
+OP_ADD, OP_SUB, OP_MUL, OP_DIV, LP, RP, NUM, VAR, FUNC = range(9)
+OP_KINDS = {"+": OP_ADD, "-": OP_SUB, "*": OP_MUL, "/": OP_DIV, "(": LP, ")": RP}
+PREC = (1, 1, 2, 2, 0, 0, 0, 0, 0)
+FUNCS = {"T", "INV", "DET", "TRACE", "RANK", "RREF"}
 
 
+# One alternative per token class: whitespace, word, number, operator, anything else
+_TOKEN_RE = re.compile(r"\s+|([A-Za-z]+)|([0-9][0-9.]*|\.[0-9][0-9.]*)|([-+*/()])|(.)")
 
 
 def tokenize(expr: str):
     tokens = []
-    i = 0
-    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
-    ops = "+-*/()"
-    digits = "0123456789"
     
-    # First pass: raw tokenization
+    # First pass: raw tokenization into (kind, payload) tuples
     raw_tokens = []
-    while i < len(expr):
-        ch = expr[i]
-        if ch.isspace():
-            i += 1
-            continue
-        if ch in ops:
-            raw_tokens.append({"type": ch, "value": ch})
-            i += 1
-            continue
-        if ch in digits or (ch == '.' and i + 1 < len(expr) and expr[i + 1] in digits):
-            j = i
-            dot_count = 0
-            while j < len(expr) and (expr[j] in digits or expr[j] == '.'):
-                if expr[j] == '.':
-                    dot_count += 1
-                    if dot_count > 1:
-                        raise ValueError("Invalid number format")
-                j += 1
-            num = expr[i:j]
-            raw_tokens.append({"type": "NUMBER", "value": num})
-            i = j
-            continue
-        if ch in letters:
-            j = i
-            while j < len(expr) and expr[j] in letters:
-                j += 1
-            word = expr[i:j].upper()
-            raw_tokens.append({"type": "WORD", "value": word})
-            i = j
+    for m in _TOKEN_RE.finditer(expr):
+        group = m.lastindex
+        if group is None:
             continue
-        raise ValueError(f"Unexpected character: {ch}")
+        text = m.group(group)
+        if group == 1:
+            word = text.upper()
+            raw_tokens.append((FUNC if word in FUNCS else VAR, word))
+        elif group == 2:
+            if text.count(".") > 1:
+                raise ValueError("Invalid number format")
+            raw_tokens.append((NUM, text))
+        elif group == 3:
+            raw_tokens.append((OP_KINDS[text], text))
+        else:
+            raise ValueError(f"Unexpected character: {text}")
 
     # Second pass: insert implicit multiplication
     if not raw_tokens:
@@ -105,34 +150,24 @@ def tokenize(expr: str):
         
     tokens.append(raw_tokens[0])
     for k in range(1, len(raw_tokens)):
-        prev = raw_tokens[k-1]
-        curr = raw_tokens[k]
+        prev = raw_tokens[k-1][0]
+        curr = raw_tokens[k][0]
         
         # Rule: Insert * if:
-        # 1. NUMBER followed by WORD or (
-        # 2. ) followed by WORD or ( or NUMBER
-        # 3. WORD (variable) followed by WORD or ( or NUMBER?
-        #    Careful with functions like T(...). WORD followed by ( is function call IF WORD is function.
-        #    If WORD is variable, it might be A(B)?
-        
-        insert_mult = False
-        if prev["type"] == "NUMBER":
-            if curr["type"] in ["WORD", "("]:
-                insert_mult = True
-        elif prev["type"] == ")":
-            if curr["type"] in ["WORD", "(", "NUMBER"]:
-                insert_mult = True
-        elif prev["type"] == "WORD":
-             # If prev is NOT a function (T, INV...), and followed by something, maybe?
-             # But our RPN parser treats WORD as function only if in specific set.
-             # Checking against "funcs" set here would be good but it's defined in to_rpn.
-             # Let's be conservative. The user case is `(2/3)A` -> `)` followed by `WORD`.
-             pass
+        # 1. NUMBER followed by a word or (
+        # 2. ) followed by a word or ( or NUMBER
+        # A VAR followed by ( is left alone: A(B) is not a supported form.
+        if prev == NUM:
+            insert_mult = curr in (VAR, FUNC, LP)
+        elif prev == RP:
+            insert_mult = curr in (VAR, FUNC, LP, NUM)
+        else:
+            insert_mult = False
 
         if insert_mult:
-            tokens.append({"type": "*", "value": "*"})
+            tokens.append((OP_MUL, "*"))
         
-        tokens.append(curr)
+        tokens.append(raw_tokens[k])
         
     return tokens
 
@@ -140,161 +175,456 @@ def tokenize(expr: str):
 def to_rpn(tokens):
     out = []
     ops = []
-    prec = {"+": 1, "-": 1, "*": 2, "/": 2}  # <-- add '/' here
-    funcs = {"T", "INV", "DET", "TRACE", "RANK", "RREF"}
     for t in tokens:
-        tt = t["type"]
-        if tt == "WORD":
-            if t["value"] in funcs:
-                ops.append({"type": "FUNC", "value": t["value"]})
-            else:
-                out.append({"type": "VAR", "value": t["value"]})
-        elif tt == "NUMBER":
-            out.append({"type": "NUMBER", "value": t["value"]})
-        elif tt == "(":
+        tt = t[0]
+        if tt == VAR or tt == NUM:
+            out.append(t)
+        elif tt == FUNC or tt == LP:
             ops.append(t)
-        elif tt == ")":
-            while ops and ops[-1]["type"] != "(":
+        elif tt == RP:
+            while ops and ops[-1][0] != LP:
                 out.append(ops.pop())
             if not ops:
                 raise ValueError("Mismatched parentheses")
             ops.pop()
-            if ops and ops[-1]["type"] == "FUNC":
+            if ops and ops[-1][0] == FUNC:
                 out.append(ops.pop())
-        elif tt in "+-*/":  # <-- add '/' here
-            while ops and ops[-1]["type"] in "+-*/" and prec[tt] <= prec[ops[-1]["type"]]:
+        elif tt < LP:
+            while ops and ops[-1][0] < LP and PREC[tt] <= PREC[ops[-1][0]]:
                 out.append(ops.pop())
             ops.append(t)
         else:
             raise ValueError("Unknown token")
     while ops:
-        if ops[-1]["type"] == "(":
+        if ops[-1][0] == LP:
             raise ValueError("Mismatched parentheses")
         out.append(ops.pop())
     return out
 
 
-def format_matrix_result(m: Matrix, simplify: bool = False) -> List[List[str]]:
+@functools.lru_cache(maxsize=1024)
+def _simplify(expr):
+    # SymPy expressions hash structurally, so equal cells share one simplify() call
+    return sp_simplify(expr)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile(expr: str) -> tuple:
+    # The RPN only depends on the expression text; a tuple keeps the shared copy immutable
+    return tuple(_peephole(to_rpn(tokenize(expr))))
+
+
+# Internal functions introduced by _peephole; users can't spell them since
+# the tokenizer only emits FUNC for names in FUNCS.
+#   INVINV(X): X, after checking X is invertible (replaces INV(INV(X)))
+#   GRAM(X):   T(X)*X, computed on its upper triangle only
+_MATRIX_FUNCS = {"T", "INV", "RREF", "INVINV", "GRAM"}
+
+
+def _arith(kind: int, a, b):
+    if kind == OP_ADD:
+        return a + b
+    if kind == OP_SUB:
+        return a - b
+    if kind == OP_MUL:
+        return a * b
+    return a / b
+
+
+def _peephole(rpn) -> list:
+    out = []
+    for tok in rpn:
+        tt, value = tok
+        if tt == NUM:
+            # parse once here so literals are cached with the RPN and can be folded
+            out.append((NUM, _parse(value)))
+            continue
+        if tt == FUNC and out and out[-1][0] == FUNC:
+            prev = out[-1][1]
+            # T(T(X)) -> X, but only when X is surely a matrix: T of a scalar must still fail
+            if value == "T" and prev == "T" and len(out) >= 2 and (
+                out[-2][0] == VAR or (out[-2][0] == FUNC and out[-2][1] in _MATRIX_FUNCS)
+            ):
+                out.pop()
+                continue
+            if value == "INV" and prev == "INV":
+                out[-1] = (FUNC, "INVINV")
+                continue
+        elif tt < LP and len(out) >= 2 and out[-1][0] == NUM and out[-2][0] == NUM:
+            b = out.pop()[1]
+            a = out.pop()[1]
+            out.append((NUM, _arith(tt, a, b)))
+            continue
+        elif tt == OP_MUL and len(out) >= 3 and out[-1][0] == VAR and out[-2] == (FUNC, "T") and out[-3] == out[-1]:
+            del out[-2:]
+            out.append((FUNC, "GRAM"))
+            continue
+        out.append(tok)
+    return out
+
+
+# latex() builds a new LatexPrinter, settings and all, on every call. One shared
+# printer with default settings gives the same output; its only mutable state
+# is a recursion counter that LaTeX output doesn't depend on.
+_latex = LatexPrinter().doprint
+
+
+def format_matrix_result(m: ImmutableMatrix, simplify: bool = False) -> List[List[str]]:
     # Only simplify if requested, otherwise use doit() which is faster for basic operations
-    def process(val):
-        if simplify:
-            return latex(sp_simplify(val))
-        return latex(val.doit())
-        
-    return [[process(m[r, c]) for c in range(m.shape[1])] for r in range(m.shape[0])]
+    rows = m.tolist()
+    if simplify:
+        return [[_latex(_simplify(v)) for v in row] for row in rows]
+    return [[_latex(v.doit()) for v in row] for row in rows]
+
+
+# Matrix functions are deterministic and ImmutableMatrix hashes by value, so
+# their results are cached process-wide. The bound keeps memory in check when
+# inputs never repeat.
+MATRIX_FUNC_CACHE_SIZE = 64
+
+
+@functools.lru_cache(maxsize=MATRIX_FUNC_CACHE_SIZE)
+def _det(m: ImmutableMatrix):
+    # SymEngine is only used where its result is identical to SymPy's: non-empty
+    # square matrices with exact rational entries. Symbolic entries come back in
+    # a different (uglier) form, and degenerate shapes crash the C++ core.
+    if symengine is not None and m.rows == m.cols and m.rows and all(v.is_Rational for v in m):
+        return symengine.Matrix(m).det()._sympy_()
+    return m.det()
+
+
+@functools.lru_cache(maxsize=MATRIX_FUNC_CACHE_SIZE)
+def _inv(m: ImmutableMatrix) -> ImmutableMatrix:
+    return m.inv()
+
+
+@functools.lru_cache(maxsize=MATRIX_FUNC_CACHE_SIZE)
+def _trace(m: ImmutableMatrix):
+    return m.trace()
+
+
+@functools.lru_cache(maxsize=MATRIX_FUNC_CACHE_SIZE)
+def _rank(m: ImmutableMatrix) -> Integer:
+    return Integer(m.rank())
+
+
+@functools.lru_cache(maxsize=MATRIX_FUNC_CACHE_SIZE)
+def _rref(m: ImmutableMatrix) -> ImmutableMatrix:
+    rref_m, _ = m.rref()
+    return rref_m.as_immutable()
+
+
+# Program opcodes. Function calls sit between the pushes and the binary
+# operators, so `op < BIN_ADD` after the push checks means a function call.
+(PUSH_MATRIX, PUSH_SCALAR, CALL_T, CALL_INV, CALL_DET, CALL_TRACE, CALL_RANK, CALL_RREF,
+ CALL_INV_INV, CALL_GRAM, BIN_ADD, BIN_SUB, BIN_MUL, BIN_DIV) = range(14)
+CALL_OPCODES = {"T": CALL_T, "INV": CALL_INV, "DET": CALL_DET,
+                "TRACE": CALL_TRACE, "RANK": CALL_RANK, "RREF": CALL_RREF,
+                "INVINV": CALL_INV_INV, "GRAM": CALL_GRAM}
+
+
+def compile_program(rpn, matrices_map: dict) -> list:
+    # Lower the RPN tokens to (opcode, arg) pairs. Matrix names and number
+    # literals are resolved here so eval_rpn's loop does no lookups or parsing.
+    program = []
+    for tt, value in rpn:
+        if tt == VAR:
+            if value not in matrices_map:
+                raise ValueError(f"Unknown matrix: {value}")
+            program.append((PUSH_MATRIX, matrices_map[value]))
+        elif tt == NUM:
+            # _compile hands over literals already parsed
+            program.append((PUSH_SCALAR, _parse(value) if isinstance(value, str) else value))
+        elif tt == FUNC:
+            # the arg names the function in "expects a matrix" errors
+            program.append((CALL_OPCODES[value], "INV" if value == "INVINV" else value))
+        elif tt < LP:
+            program.append((BIN_ADD + tt, None))
+        else:
+            raise ValueError("Invalid token type")
+    return program
+
+
+def _gram(m: ImmutableMatrix) -> ImmutableMatrix:
+    # T(m)*m is symmetric, so only the upper triangle needs computing. SymPy's
+    # own product is faster on purely numeric matrices, so those still use it.
+    if not m.rows or all(v.is_Number for v in m):
+        return m.T * m
+    n = m.cols
+    cols = m.T.tolist()
+    out = [[None] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(i, n):
+            out[i][j] = out[j][i] = Add(*[x * y for x, y in zip(cols[i], cols[j])])
+    return ImmutableMatrix(n, n, [v for row in out for v in row])
+
+
+INVALID_EXPRESSION = "Invalid expression format. Use formats like: A + B, T(A), INV(A), DET(A)"
+
+_eval_state = threading.local()
+
+
+def _stack_buffer(size: int) -> list:
+    # One evaluation stack per thread, reused across requests and grown on demand
+    buf = getattr(_eval_state, "stack", None)
+    if buf is None:
+        buf = _eval_state.stack = []
+    if len(buf) < size:
+        buf.extend([None] * (size - len(buf)))
+    return buf
 
 
 def eval_rpn(rpn, matrices_map: dict, simplify: bool = False) -> EvalResponse:
-    stack = []
-    for t in rpn:
-        tt = t["type"]
-        if tt == "VAR":
-            if t["value"] not in matrices_map:
-                raise ValueError(f"Unknown matrix: {t['value']}")
-            stack.append(("matrix", matrices_map[t["value"]]))
-        elif tt == "NUMBER":
-            stack.append(("scalar", t["value"]))
-        elif tt == "FUNC":
-            kind, a = stack.pop()
+    program = compile_program(rpn, matrices_map)
+    stack = _stack_buffer(len(program))
+    try:
+        return _run_program(program, stack, simplify)
+    finally:
+        # drop references to this evaluation's matrices
+        for i in range(len(program)):
+            stack[i] = None
+
+
+def _run_program(program: list, stack: list, simplify: bool) -> EvalResponse:
+    # `stack` is a preallocated buffer and `top` the number of live entries.
+    # Operators overwrite their first operand's slot with the result.
+    # Intermediate values are never simplified: that is done once, on the final
+    # result, and only when the caller asked for it.
+    top = 0
+    # Matrix-matrix results seen during this evaluation, keyed by value (the
+    # matrices are immutable, hence hashable). A+B and B+A share an entry;
+    # products are keyed by operand order.
+    op_cache = {}
+    for op, arg in program:
+        if op == PUSH_MATRIX:
+            stack[top] = ("matrix", arg)
+            top += 1
+            continue
+        if op == PUSH_SCALAR:
+            stack[top] = ("scalar", arg)
+            top += 1
+            continue
+        if top < 1 or (op >= BIN_ADD and top < 2):
+            raise ValueError(INVALID_EXPRESSION)
+        if op < BIN_ADD:
+            kind, a = stack[top - 1]
             if kind != "matrix":
-                raise ValueError(f"{t['value']} expects a matrix")
-            if t["value"] == "T":
-                stack.append(("matrix", a.T))
-            elif t["value"] == "INV":
-                stack.append(("matrix", a.inv()))
-            elif t["value"] == "DET":
-                val = a.det()
-                if simplify:
-                    val = sp_simplify(val)
-                stack.append(("scalar", str(val)))
-            elif t["value"] == "TRACE":
-                val = a.trace()
-                if simplify:
-                    val = sp_simplify(val)
-                stack.append(("scalar", str(val)))
-            elif t["value"] == "RANK":
-                stack.append(("scalar", str(int(a.rank()))))
-            elif t["value"] == "RREF":
-                rref_m, _ = a.rref()
-                stack.append(("matrix", rref_m))
+                raise ValueError(f"{arg} expects a matrix")
+            if op == CALL_T:
+                stack[top - 1] = ("matrix", a.T)
+            elif op == CALL_INV:
+                stack[top - 1] = ("matrix", _inv(a))
+            elif op == CALL_DET:
+                stack[top - 1] = ("scalar", _det(a))
+            elif op == CALL_TRACE:
+                stack[top - 1] = ("scalar", _trace(a))
+            elif op == CALL_RANK:
+                stack[top - 1] = ("scalar", _rank(a))
+            elif op == CALL_RREF:
+                stack[top - 1] = ("matrix", _rref(a))
+            elif op == CALL_INV_INV:
+                # let inv() raise its usual error when X has no inverse
+                if a.rows != a.cols or _det(a).is_zero:
+                    _inv(a)
+                stack[top - 1] = ("matrix", a)
             else:
-                raise ValueError("Unsupported function")
-        elif tt in "+-*/":
-            b_kind, b = stack.pop()
-            a_kind, a = stack.pop()
+                stack[top - 1] = ("matrix", _gram(a))
+        else:
+            top -= 1
+            a_kind, a = stack[top - 1]
+            b_kind, b = stack[top]
             # scalar * matrix or matrix * scalar
-            if a_kind == "scalar" and b_kind == "matrix" and tt == "*":
-                stack.append(("matrix", parse_expr(str(a), transformations=TRANSFORMS) * b))
-                continue
-            if a_kind == "matrix" and b_kind == "scalar" and tt == "*":
-                stack.append(("matrix", a * parse_expr(str(b), transformations=TRANSFORMS)))
+            if a_kind != b_kind and op == BIN_MUL:
+                stack[top - 1] = ("matrix", a * b)
                 continue
-            # scalar / matrix or matrix / scalar
-            if a_kind == "scalar" and b_kind == "matrix" and tt == "/":
-                stack.append(("matrix", parse_expr(str(a), transformations=TRANSFORMS) / b))
-                continue
-            if a_kind == "matrix" and b_kind == "scalar" and tt == "/":
-                stack.append(("matrix", a / parse_expr(str(b), transformations=TRANSFORMS)))
+            # matrix / scalar; dividing by a matrix is never supported
+            if a_kind != b_kind and op == BIN_DIV:
+                if b_kind == "matrix":
+                    raise ValueError("Matrix division is not supported")
+                stack[top - 1] = ("matrix", a / b)
                 continue
             # scalar-scalar
             if a_kind == "scalar" and b_kind == "scalar":
-                # For scalars, we might want to keep them as strings until the end or parse them
-                # But here we stick to strings -> sympy -> string
-                val_a = parse_expr(str(a), transformations=TRANSFORMS)
-                val_b = parse_expr(str(b), transformations=TRANSFORMS)
-                if tt == "+":
-                    res = val_a + val_b
-                elif tt == "-":
-                    res = val_a - val_b
-                elif tt == "*":
-                    res = val_a * val_b
-                elif tt == "/":
-                    res = val_a / val_b
-                
-                if simplify:
-                    res = sp_simplify(res)
-                stack.append(("scalar", str(res)))
+                stack[top - 1] = ("scalar", _arith(op - BIN_ADD, a, b))
                 continue
             # matrix-matrix operations
             if a_kind != "matrix" or b_kind != "matrix":
                 raise ValueError("Only matrix-matrix +,-,* are supported")
-            if tt == "+":
-                stack.append(("matrix", a + b))
-            elif tt == "-":
-                stack.append(("matrix", a - b))
-            elif tt == "*":
-                stack.append(("matrix", a * b))
-            elif tt == "/":
+            if op == BIN_ADD:
+                key = (BIN_ADD, frozenset((a, b)))
+            elif op == BIN_MUL:
+                key = (BIN_MUL, a, b)
+            else:
+                key = None
+            if key is not None and key in op_cache:
+                stack[top - 1] = ("matrix", op_cache[key])
+            elif op == BIN_ADD:
+                res = a + b
+                op_cache[key] = res
+                stack[top - 1] = ("matrix", res)
+            elif op == BIN_SUB:
+                stack[top - 1] = ("matrix", a - b)
+            elif op == BIN_MUL:
+                res = a * b
+                op_cache[key] = res
+                stack[top - 1] = ("matrix", res)
+            else:
                 raise ValueError("Matrix division is not supported")
-        else:
-            raise ValueError("Invalid token type")
-    if len(stack) != 1:
-        raise ValueError("Invalid expression format. Use formats like: A + B, T(A), INV(A), DET(A)")
+    if top != 1:
+        raise ValueError(INVALID_EXPRESSION)
     kind, val = stack[0]
     if kind == "matrix":
         return EvalResponse(kind="matrix", value=format_matrix_result(val, simplify))
     
     # Final scalar result
-    final_val = parse_expr(str(val), transformations=TRANSFORMS) # ensure it is sympy object
     if simplify:
-        final_val = sp_simplify(final_val)
+        final_val = _simplify(val)
     else:
-        final_val = final_val.doit()
+        final_val = val.doit()
         
-    return EvalResponse(kind="scalar", value=latex(final_val))
+    return EvalResponse(kind="scalar", value=_latex(final_val))
 
 
-@app.post("/evaluate", response_model=EvalResponse)
-def evaluate(req: EvalRequest):
+RESPONSE_CACHE_SIZE = 512
+# Responses are cached already serialised to JSON, so hits skip serialisation too
+_response_cache: "OrderedDict[bytes, str]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+
+def _matrices_key(matrices: List[MatrixPayload]) -> tuple:
+    # Later matrices win on a name clash, exactly like build_matrices_map()
+    by_name = {}
+    for m in matrices:
+        by_name[m.name.upper()] = (m.rows, m.cols, tuple(tuple(row) for row in m.data))
+    return tuple(sorted(by_name.items()))
+
+
+def _request_key(req: EvalRequest) -> bytes:
+    canonical = (_matrices_key(req.matrices), req.expression, req.simplify_result)
+    return hashlib.blake2b(repr(canonical).encode(), digest_size=16).digest()
+
+
+def _response_cache_get(key: bytes) -> Optional[str]:
+    with _response_cache_lock:
+        body = _response_cache.get(key)
+        if body is not None:
+            _response_cache.move_to_end(key)
+        return body
+
+
+def _response_cache_put(key: bytes, body: str) -> None:
+    with _response_cache_lock:
+        _response_cache[key] = body
+        _response_cache.move_to_end(key)
+        if len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+
+def build_matrices_map(matrices: List[MatrixPayload]) -> dict:
+    matrices_map = {}
+    for m in matrices:
+        sym_m = build_symbolic_matrix(m.data)
+        matrices_map[m.name.upper()] = sym_m
+    return matrices_map
+
+
+# Requests are evaluated off the event loop. Whatever is already queued when
+# the worker wakes up is taken as one batch, and requests in it that send the
+# same matrices share one matrices_map. The worker never waits for more work
+# to arrive, so a lone request is dispatched at once.
+_batch_queue: Optional[asyncio.Queue] = None
+_batch_loop: Optional[asyncio.AbstractEventLoop] = None
+_batch_task: Optional[asyncio.Task] = None
+# strong references so running group tasks aren't garbage collected
+_group_tasks: set = set()
+
+
+def _evaluate_one(req: EvalRequest, matrices_map: dict) -> str:
+    resp = eval_rpn(_compile(req.expression), matrices_map, req.simplify_result)
+    # serialised here, off the event loop, by pydantic-core
+    return resp.model_dump_json()
+
+
+def _resolve(fut: asyncio.Future, body: Optional[str], err: Optional[Exception]) -> None:
+    if fut.done():  # client went away
+        return
+    if err is None:
+        fut.set_result(body)
+    else:
+        fut.set_exception(err)
+
+
+async def _run_one(req: EvalRequest, fut: asyncio.Future, matrices_map: dict) -> None:
+    loop = asyncio.get_running_loop()
+    try:
+        body = await loop.run_in_executor(None, _evaluate_one, req, matrices_map)
+    except Exception as e:
+        _resolve(fut, None, e)
+    else:
+        _resolve(fut, body, None)
+
+
+async def _run_group(group: list) -> None:
+    # Every request in the group sends the same matrices: build them once, then
+    # evaluate each request in its own executor call so a slow one holds up nobody.
+    loop = asyncio.get_running_loop()
     try:
-        matrices_map = {}
-        for m in req.matrices:
-            sym_m = build_symbolic_matrix(m.data)
-            matrices_map[m.name.upper()] = sym_m
-        rpn = to_rpn(tokenize(req.expression))
-        return eval_rpn(rpn, matrices_map, req.simplify_result)
+        matrices_map = await loop.run_in_executor(None, build_matrices_map, group[0][0].matrices)
     except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        for _, fut in group:
+            _resolve(fut, None, e)
+        return
+    await asyncio.gather(*(_run_one(req, fut, matrices_map) for req, fut in group))
+
+
+async def _run_batches(queue: asyncio.Queue) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        while not queue.empty():
+            batch.append(queue.get_nowait())
+        groups = {}
+        for req, fut in batch:
+            try:
+                mkey = _matrices_key(req.matrices)
+            except Exception as e:
+                _resolve(fut, None, e)
+                continue
+            groups.setdefault(mkey, []).append((req, fut))
+        # Groups run as independent tasks; the loop goes straight back to
+        # collecting the next batch instead of waiting for this one.
+        for group in groups.values():
+            task = loop.create_task(_run_group(group))
+            _group_tasks.add(task)
+            task.add_done_callback(_group_tasks.discard)
+
+
+def _get_batch_queue() -> asyncio.Queue:
+    # Started lazily so the worker always lives on the loop serving requests
+    global _batch_queue, _batch_loop, _batch_task
+    loop = asyncio.get_running_loop()
+    if _batch_loop is not loop:
+        _batch_queue = asyncio.Queue()
+        _batch_loop = loop
+        _batch_task = loop.create_task(_run_batches(_batch_queue))
+    return _batch_queue
+
+
+@app.post("/evaluate", response_model=EvalResponse)
+async def evaluate(req: EvalRequest):
+    # response_model only documents the schema: the body is already JSON, so
+    # returning a Response skips FastAPI's validate-and-encode pass.
+    key = _request_key(req)
+    body = _response_cache_get(key)
+    if body is None:
+        fut = asyncio.get_running_loop().create_future()
+        await _get_batch_queue().put((req, fut))
+        try:
+            body = await fut
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        _response_cache_put(key, body)
+    return Response(content=body, media_type="application/json")
 
 
 @app.get("/")